@@ -15,13 +15,40 @@ Date: June 2025
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from collections import Counter
-import re
 from datetime import datetime
-import warnings
-warnings.filterwarnings('ignore')
+
+
+def _per_year_stats(year_idx, rating, imdb, content_year, content_age, n_years):
+    """Per-year stats from np.bincount sums and counts over the dense year keys
+    
+    Columns: count, mean rating, rating std, mean IMDb rating,
+    mean content year, mean content age, % of ratings 8+
+    
+    Content year/age are NaN for titles without a release year and are
+    averaged over the remaining titles only.
+    """
+    rating = rating.astype(np.float64)
+    count = np.bincount(year_idx, minlength=n_years).astype(np.float64)
+    rating_sum = np.bincount(year_idx, weights=rating, minlength=n_years)
+    rating_sq = np.bincount(year_idx, weights=rating * rating, minlength=n_years)
+    high = np.bincount(year_idx, weights=rating >= 8, minlength=n_years)
+    has_imdb = ~np.isnan(imdb)
+    imdb_sum = np.bincount(year_idx[has_imdb], weights=imdb[has_imdb], minlength=n_years)
+    imdb_count = np.bincount(year_idx[has_imdb], minlength=n_years)
+    has_age = ~np.isnan(content_age)
+    year_sum = np.bincount(year_idx[has_age], weights=content_year[has_age], minlength=n_years)
+    age_sum = np.bincount(year_idx[has_age], weights=content_age[has_age], minlength=n_years)
+    age_count = np.bincount(year_idx[has_age], minlength=n_years)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = rating_sum / count
+        std = np.sqrt(np.maximum((rating_sq - count * mean * mean) / (count - 1), 0.0))
+        std[count < 2] = np.nan
+        out = np.column_stack([count, mean, std, imdb_sum / imdb_count,
+                               year_sum / age_count, age_sum / age_count, high / count * 100])
+    out[count == 0] = np.nan
+    return out
+
 
 class IMDbAnalyzer:
     """Main class for analyzing IMDb ratings data"""
@@ -32,31 +59,88 @@ class IMDbAnalyzer:
         self.df = None
         self.yearly_stats = None
         self.director_analysis = None
+        self.genre_works = None
+        self._basic = None
+        self._rating = None
+        self._year = None
+        self._imdb = None
+        self._content_age = None
         
     def load_data(self):
         """Load and prepare the IMDb data"""
         print("Loading IMDb ratings data...")
-        self.df = pd.read_csv(self.csv_path)
-        
-        # Convert date columns
-        self.df['Date Rated'] = pd.to_datetime(self.df['Date Rated'])
-        self.df['Release Date'] = pd.to_datetime(self.df['Release Date'], errors='coerce')
+        # Only read the columns the analysis touches, with pre-declared dtypes.
+        # The pyarrow engine/backend keeps the string columns in Arrow buffers.
+        self.df = pd.read_csv(
+            self.csv_path,
+            engine='pyarrow',
+            dtype_backend='pyarrow',
+            usecols=['Title Type', 'Your Rating', 'IMDb Rating', 'Year',
+                     'Directors', 'Genres', 'Date Rated', 'Release Date'],
+            dtype={
+                'Title Type': 'category',
+                'Your Rating': 'int8',
+                'IMDb Rating': 'float32',
+                'Directors': 'string[pyarrow]',
+                'Genres': 'string[pyarrow]'
+            }
+        )
+        
+        # Convert date columns (IMDb exports use a fixed YYYY-MM-DD format)
+        self.df['Date Rated'] = pd.to_datetime(self.df['Date Rated'], format='%Y-%m-%d', cache=True)
+        self.df['Release Date'] = pd.to_datetime(self.df['Release Date'], format='%Y-%m-%d', errors='coerce')
         self.df['Rating Year'] = self.df['Date Rated'].dt.year
-        self.df['Content_Age'] = datetime.now().year - self.df['Year']
+
+        # Year is read without a dtype hint and coerced here, so blanks or junk
+        # become missing instead of failing the load; those titles get no Content_Age.
+        # float64 turns both Arrow nulls and unparseable values into NaN.
+        year = pd.to_numeric(self.df['Year'], errors='coerce').astype('float64')
+        self.df['Year'] = year.astype('Int16')
+        missing_year = self.df['Year'].isna().sum()
+        if missing_year:
+            print(f"{missing_year} entries have no release year and are left out of content age stats")
+
+        self.df['Content_Age'] = (datetime.now().year - self.df['Year']).astype('Int16')
+        self.df['Age_Group'] = pd.cut(self.df['Content_Age'], 
+                                    bins=[-1, 5, 15, 30, 50, 200], 
+                                    labels=['Very Recent (0-5y)', 'Recent (6-15y)', 
+                                          'Older (16-30y)', 'Classic (31-50y)', 'Very Classic (50y+)'])
+        
+        # Split the multi-valued name columns once for every downstream analysis
+        self.df['_directors'] = self.df['Directors'].fillna('').str.strip().str.split(r'\s*,\s*')
+        self.df['_genres'] = self.df['Genres'].fillna('').str.strip().str.split(r'\s*,\s*')
+        
+        # Contiguous arrays of the hot numeric columns for the tight loops
+        self._rating = self.df['Your Rating'].to_numpy(dtype=np.int8)
+        self._year = self.df['Rating Year'].to_numpy(dtype=np.int16)
+        self._imdb = self.df['IMDb Rating'].to_numpy(dtype=np.float32, na_value=np.nan)
+        self._content_age = self.df['Content_Age'].to_numpy(dtype=np.float32, na_value=np.nan)
+        
+        self._basic = None
+        self.genre_works = None
         
         print(f"Loaded {len(self.df)} ratings from {self.df['Date Rated'].min().date()} to {self.df['Date Rated'].max().date()}")
         
-    def basic_statistics(self):
-        """Generate basic statistics about the dataset"""
-        stats = {
+    def _basic_stats(self):
+        """Basic statistics, computed once per load without printing"""
+        if self._basic is not None:
+            return self._basic
+        
+        type_counts = self.df['Title Type'].value_counts()
+        self._basic = {
             'total_entries': len(self.df),
-            'movies': len(self.df[self.df['Title Type'] == 'Movie']),
-            'tv_series': len(self.df[self.df['Title Type'] == 'TV Series']),
-            'tv_episodes': len(self.df[self.df['Title Type'] == 'TV Episode']),
+            'movies': int(type_counts.get('Movie', 0)),
+            'tv_series': int(type_counts.get('TV Series', 0)),
+            'tv_episodes': int(type_counts.get('TV Episode', 0)),
             'avg_rating': self.df['Your Rating'].mean(),
             'most_common_rating': self.df['Your Rating'].mode().iloc[0],
             'imdb_correlation': self.df['Your Rating'].corr(self.df['IMDb Rating'])
         }
+        return self._basic
+        
+    def basic_statistics(self):
+        """Generate basic statistics about the dataset"""
+        stats = self._basic_stats()
         
         print("\n=== BASIC STATISTICS ===")
         print(f"Total entries: {stats['total_entries']}")
@@ -71,15 +155,27 @@ class IMDbAnalyzer:
         
     def yearly_evolution(self):
         """Analyze year-over-year patterns"""
-        self.yearly_stats = self.df.groupby('Rating Year').agg({
-            'Your Rating': ['count', 'mean', 'std'],
-            'IMDb Rating': 'mean',
-            'Year': 'mean',
-            'Content_Age': 'mean'
-        }).round(2)
-        
-        self.yearly_stats.columns = ['Count', 'Avg_Your_Rating', 'Std_Your_Rating', 
-                                   'Avg_IMDb_Rating', 'Avg_Content_Year', 'Avg_Content_Age']
+        year_min = int(self._year.min())
+        n_years = int(self._year.max()) - year_min + 1
+        
+        # Dense year keys, so bincount sums/counts beat a hash or sort based groupby
+        per_year = _per_year_stats(
+            self._year - year_min,
+            self._rating,
+            self._imdb,
+            self.df['Year'].to_numpy(dtype=np.float32, na_value=np.nan),
+            self._content_age,
+            n_years
+        )
+        rated = ~np.isnan(per_year[:, 0])  # Skip years without any ratings
+        
+        self.yearly_stats = pd.DataFrame(
+            per_year[rated],
+            index=pd.Index(year_min + np.arange(n_years)[rated], name='Rating Year'),
+            columns=['Count', 'Avg_Your_Rating', 'Std_Your_Rating', 'Avg_IMDb_Rating',
+                     'Avg_Content_Year', 'Avg_Content_Age', 'Pct_High']
+        ).round(2)
+        self.yearly_stats['Count'] = self.yearly_stats['Count'].astype(int)
         
         print("\n=== YEAR-OVER-YEAR EVOLUTION ===")
         print(self.yearly_stats)
@@ -88,28 +184,24 @@ class IMDbAnalyzer:
         
     def analyze_directors(self):
         """Analyze director preferences and patterns"""
-        # Clean and extract directors
-        director_list = []
-        for directors in self.df['Directors'].fillna(''):
-            if directors:
-                directors_split = [d.strip() for d in str(directors).split(',')]
-                director_list.extend(directors_split)
-        
-        director_counts = Counter(director_list)
-        top_directors = director_counts.most_common(15)
-        
+        # One row per (title, director) pair
+        works = self.df[['Your Rating', 'Date Rated', '_directors']].explode('_directors')
+        works = works.rename(columns={'_directors': 'Director'})
+        works = works[works['Director'].notna() & (works['Director'] != '')]
+
+        # Frequency table, then one aggregation pass over the top directors' works
+        director_counts = works['Director'].value_counts().head(15)
+        director_counts = director_counts[director_counts >= 5]  # Only directors with 5+ works
+        director_stats = works[works['Director'].isin(director_counts.index)].groupby('Director').agg(
+            Count=('Your Rating', 'size'),
+            Avg_Rating=('Your Rating', 'mean'),
+            Std_Rating=('Your Rating', 'std'),
+            Latest_Work=('Date Rated', 'max')
+        ).reindex(director_counts.index)  # Keep frequency order
+        director_stats['Latest_Work'] = director_stats['Latest_Work'].dt.strftime('%Y-%m-%d')
+
         # Detailed analysis for top directors
-        self.director_analysis = []
-        for director, count in top_directors:
-            if director and count >= 5:  # Only directors with 5+ works
-                director_works = self.df[self.df['Directors'].str.contains(director, na=False)]
-                self.director_analysis.append({
-                    'Director': director,
-                    'Count': count,
-                    'Avg_Rating': director_works['Your Rating'].mean(),
-                    'Std_Rating': director_works['Your Rating'].std(),
-                    'Latest_Work': director_works['Date Rated'].max().strftime('%Y-%m-%d')
-                })
+        self.director_analysis = director_stats.reset_index().to_dict('records')
         
         director_df = pd.DataFrame(self.director_analysis)
         
@@ -120,25 +212,27 @@ class IMDbAnalyzer:
             
         return director_df
         
+    def _genre_works(self):
+        """One row per (title, genre) pair, built once per load and shared with the charts"""
+        if self.genre_works is None:
+            genres = self.df[['Your Rating', 'Rating Year', '_genres']].explode('_genres', ignore_index=True)
+            genres = genres.rename(columns={'_genres': 'Genre'})
+            self.genre_works = genres[genres['Genre'].notna() & (genres['Genre'] != '')]
+        return self.genre_works
+        
     def analyze_genres(self):
         """Analyze genre preferences"""
-        genre_list = []
-        for genres in self.df['Genres'].fillna(''):
-            if genres:
-                genre_split = [g.strip() for g in str(genres).split(',')]
-                genre_list.extend(genre_split)
-        
-        genre_counts = Counter(genre_list)
-        top_genres = genre_counts.most_common(15)
+        genres = self._genre_works()
+
+        genre_counts = genres['Genre'].value_counts().head(15)
+        genre_means = genres[genres['Genre'].isin(genre_counts.index)].groupby('Genre')['Your Rating'].mean()
+        top_genres = list(genre_counts.items())
         
         print("\n=== GENRE ANALYSIS ===")
         print("Top Genres by frequency:")
         for genre, count in top_genres:
-            if genre:
-                genre_ratings = self.df[self.df['Genres'].str.contains(genre, na=False)]['Your Rating']
-                avg_rating = genre_ratings.mean()
-                percentage = (count / len(self.df)) * 100
-                print(f"{genre}: {count} works ({percentage:.1f}%), avg rating: {avg_rating:.2f}")
+            percentage = (count / len(self.df)) * 100
+            print(f"{genre}: {count} works ({percentage:.1f}%), avg rating: {genre_means[genre]:.2f}")
                 
         return top_genres
         
@@ -154,8 +248,8 @@ class IMDbAnalyzer:
             print(f"{rating}/10: {count} ratings ({percentage:.1f}%)")
         
         # High vs low ratings
-        high_ratings = len(self.df[self.df['Your Rating'] >= 8])
-        low_ratings = len(self.df[self.df['Your Rating'] <= 5])
+        high_ratings = int(np.count_nonzero(self._rating >= 8))
+        low_ratings = int(np.count_nonzero(self._rating <= 5))
         
         print(f"\nHigh ratings (8+): {high_ratings} ({high_ratings/len(self.df)*100:.1f}%)")
         print(f"Low ratings (≤5): {low_ratings} ({low_ratings/len(self.df)*100:.1f}%)")
@@ -164,29 +258,35 @@ class IMDbAnalyzer:
         
     def content_age_analysis(self):
         """Analyze preferences by content age"""
-        self.df['Age_Group'] = pd.cut(self.df['Content_Age'], 
-                                    bins=[-1, 5, 15, 30, 50, 100], 
-                                    labels=['Very Recent (0-5y)', 'Recent (6-15y)', 
-                                          'Older (16-30y)', 'Classic (31-50y)', 'Very Classic (50y+)'])
-        
-        age_stats = self.df.groupby('Age_Group')['Your Rating'].agg(['count', 'mean']).round(2)
+        age_stats = self.df.groupby('Age_Group', observed=True)['Your Rating'].agg(['count', 'mean']).round(2)
         
         print("\n=== CONTENT AGE PREFERENCES ===")
         print(age_stats)
         
         return age_stats
         
-    def create_visualizations(self, save_path='imdb_analysis_charts.png'):
-        """Create comprehensive visualizations"""
+    def create_visualizations(self, save_path='imdb_analysis_charts.png', dpi=150, format=None):
+        """Create comprehensive visualizations
+        
+        Pass format='pdf' (or a .pdf save_path) for a vector file; dpi only
+        affects raster output.
+        """
+        # Plotting libraries are only needed here, so keep them off the import path.
+        # A bare Figure renders straight to file without switching pyplot's backend.
+        from matplotlib import colormaps
+        from matplotlib.figure import Figure
+        import seaborn as sns
+        
         # Set style
         sns.set_style("whitegrid")
         sns.set_palette("husl")
         
         # Create comprehensive visualization
-        fig = plt.figure(figsize=(20, 16))
+        fig = Figure(figsize=(20, 16))
+        axes = fig.subplots(3, 3)
+        ax1, ax2, ax3, ax4, ax5, ax6, ax7, ax8, ax9 = axes.flat
         
         # 1. YoY Volume and Rating Evolution
-        ax1 = plt.subplot(3, 3, 1)
         years = self.yearly_stats.index
         ax1_twin = ax1.twinx()
         
@@ -202,7 +302,6 @@ class IMDbAnalyzer:
         ax1_twin.set_ylim(6.5, 8.5)
         
         # 2. Content Age Evolution
-        ax2 = plt.subplot(3, 3, 2)
         ax2.plot(years, self.yearly_stats['Avg_Content_Age'], 'go-', linewidth=3, markersize=8)
         ax2.set_xlabel('Year')
         ax2.set_ylabel('Avg Age of Content (years)')
@@ -211,7 +310,6 @@ class IMDbAnalyzer:
         ax2.grid(True, alpha=0.3)
         
         # 3. Rating Distribution
-        ax3 = plt.subplot(3, 3, 3)
         rating_dist = self.df['Your Rating'].value_counts().sort_index()
         ax3.bar(rating_dist.index, rating_dist.values, color='purple', alpha=0.7)
         ax3.set_xlabel('Rating')
@@ -219,22 +317,25 @@ class IMDbAnalyzer:
         ax3.set_title('Rating Distribution', fontsize=14, fontweight='bold')
         
         # 4. Your vs IMDb Rating
-        ax4 = plt.subplot(3, 3, 4)
-        ax4.scatter(self.df['IMDb Rating'], self.df['Your Rating'], alpha=0.4, s=20)
+        # 2D histogram on the ratings' own grid (0.1 IMDb steps, whole-point ratings)
+        has_imdb = ~np.isnan(self._imdb)
+        _, _, _, hist = ax4.hist2d(self._imdb[has_imdb], self._rating[has_imdb],
+                                   bins=[np.arange(0.5, 101) / 10, np.arange(0.5, 11)],
+                                   cmin=1, cmap='Blues')
+        fig.colorbar(hist, ax=ax4, label='Ratings')
         ax4.plot([4, 10], [4, 10], 'r--', alpha=0.8, label='Perfect correlation')
-        correlation = self.df['Your Rating'].corr(self.df['IMDb Rating'])
+        correlation = self._basic_stats()['imdb_correlation']
         ax4.set_xlabel('IMDb Rating')
         ax4.set_ylabel('Your Rating')
         ax4.set_title(f'Your vs IMDb Ratings (r={correlation:.3f})', fontsize=14, fontweight='bold')
         ax4.legend()
         
         # 5. Top Directors Bar Chart
-        ax5 = plt.subplot(3, 3, 5)
         if self.director_analysis:
             director_df = pd.DataFrame(self.director_analysis)
             top_directors = director_df.nlargest(10, 'Avg_Rating')
             bars = ax5.barh(range(len(top_directors)), top_directors['Avg_Rating'], 
-                          color=plt.cm.viridis(top_directors['Avg_Rating']/10))
+                          color=colormaps['viridis'](top_directors['Avg_Rating']/10))
             ax5.set_yticks(range(len(top_directors)))
             ax5.set_yticklabels(top_directors['Director'])
             ax5.set_xlabel('Average Rating')
@@ -242,20 +343,16 @@ class IMDbAnalyzer:
             ax5.set_xlim(6, 10)
         
         # 6. Genre Evolution
-        ax6 = plt.subplot(3, 3, 6)
         top_genres = ['Drama', 'Action', 'Sci-Fi', 'Comedy', 'Thriller']
-        genre_by_year = {}
+        genre_works = self._genre_works()
+        
+        # Year x genre share of ratings in one vectorized pass
+        year_sizes = self.yearly_stats['Count']
+        years_sorted = year_sizes.index
+        genre_counts = pd.crosstab(genre_works['Rating Year'], genre_works['Genre'])
+        genre_counts = genre_counts.reindex(index=years_sorted, columns=top_genres, fill_value=0)
+        genre_by_year = genre_counts.div(year_sizes, axis=0) * 100
         
-        for genre in top_genres:
-            genre_by_year[genre] = []
-            for year in sorted(self.df['Rating Year'].unique()):
-                year_data = self.df[self.df['Rating Year'] == year]
-                genre_count = len(year_data[year_data['Genres'].str.contains(genre, na=False)])
-                total_count = len(year_data)
-                percentage = (genre_count / total_count) * 100 if total_count > 0 else 0
-                genre_by_year[genre].append(percentage)
-        
-        years_sorted = sorted(self.df['Rating Year'].unique())
         for genre in top_genres:
             ax6.plot(years_sorted, genre_by_year[genre], marker='o', label=genre, linewidth=2)
         
@@ -266,7 +363,6 @@ class IMDbAnalyzer:
         ax6.tick_params(axis='x', rotation=45)
         
         # 7. Cumulative Ratings
-        ax7 = plt.subplot(3, 3, 7)
         cumulative_ratings = self.yearly_stats['Count'].cumsum()
         ax7.plot(self.yearly_stats.index, cumulative_ratings, 'mo-', linewidth=3, markersize=8)
         ax7.set_xlabel('Year')
@@ -276,18 +372,7 @@ class IMDbAnalyzer:
         ax7.grid(True, alpha=0.3)
         
         # 8. Rating Generosity
-        ax8 = plt.subplot(3, 3, 8)
-        generosity_by_year = []
-        years_list = sorted(self.df['Rating Year'].unique())
-        
-        for year in years_list:
-            year_data = self.df[self.df['Rating Year'] == year]
-            high_ratings = len(year_data[year_data['Your Rating'] >= 8])
-            total_ratings = len(year_data)
-            generosity = (high_ratings / total_ratings) * 100 if total_ratings > 0 else 0
-            generosity_by_year.append(generosity)
-        
-        ax8.plot(years_list, generosity_by_year, 'co-', linewidth=3, markersize=8)
+        ax8.plot(self.yearly_stats.index, self.yearly_stats['Pct_High'], 'co-', linewidth=3, markersize=8)
         ax8.set_xlabel('Year')
         ax8.set_ylabel('% of Ratings 8+')
         ax8.set_title('Rating Generosity Over Time', fontsize=14, fontweight='bold')
@@ -295,22 +380,20 @@ class IMDbAnalyzer:
         ax8.grid(True, alpha=0.3)
         
         # 9. Content Type Distribution
-        ax9 = plt.subplot(3, 3, 9)
         content_types = self.df['Title Type'].value_counts()
-        colors = plt.cm.Set3(np.linspace(0, 1, len(content_types)))
+        colors = colormaps['Set3'](np.linspace(0, 1, len(content_types)))
         wedges, texts, autotexts = ax9.pie(content_types.values, labels=content_types.index, 
                                           autopct='%1.1f%%', colors=colors)
         ax9.set_title('Content Type Distribution', fontsize=14, fontweight='bold')
         
-        plt.tight_layout()
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(save_path, dpi=dpi, format=format, bbox_inches='tight')
         
         print(f"\nVisualization saved as '{save_path}'")
         
     def generate_insights(self):
         """Generate comprehensive insights about viewing patterns"""
-        stats = self.basic_statistics()
+        stats = self._basic_stats()
         
         print("\n=== VIEWING TASTE CHARACTERIZATION ===")
         
@@ -320,7 +403,7 @@ class IMDbAnalyzer:
         
         # Rating generosity
         generous_threshold = 7
-        generous_percentage = len(self.df[self.df['Your Rating'] >= generous_threshold]) / len(self.df) * 100
+        generous_percentage = np.count_nonzero(self._rating >= generous_threshold) / len(self._rating) * 100
         
         print(f"Average rating: {avg_rating:.2f}")
         print(f"IMDb correlation: {imdb_correlation:.3f} ({'Strong' if abs(imdb_correlation) > 0.7 else 'Moderate' if abs(imdb_correlation) > 0.4 else 'Weak'} alignment)")